@@ -145,6 +145,18 @@ class MeetingTranscribeWorker(QThread):
             self.finished.emit({"error": str(e)})
 
 
+class MeetingSaveWorker(QThread):
+    finished = pyqtSignal(dict)
+    
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+    
+    def run(self):
+        result = self.job.wait()
+        self.finished.emit(result or {})
+
+
 class Signals(QObject):
     start_rec = pyqtSignal()
     stop_rec = pyqtSignal()
@@ -178,6 +190,7 @@ class MainWindow(QMainWindow):
         self._processing = False
         self._meeting_recording = False
         self._meeting_start_time = None
+        self._save_workers = []
         
         if MEETING_OK:
             try:
@@ -744,13 +757,40 @@ class MainWindow(QMainWindow):
                 self.btn_stop_meeting.setEnabled(False)
             if self.meeting_status:
                 self.meeting_status.setText("Готов")
-            if result and result.get("video"):
-                self._log("Видео сохранено")
-                # Небольшая задержка, чтобы файл точно появился на диске, затем обновить список
-                QTimer.singleShot(400, self._refresh_recordings)
+            if result and result.get("dropped_frames"):
+                self._log(f"Энкодер не успевал: пропущено кадров {result['dropped_frames']}")
+            if result and result.get("late_frames"):
+                self._log(f"Захват не успевал: пропущено кадров {result['late_frames']}")
+            if result and result.get("pending"):
+                # Сведение видео и звука идёт в фоне — ждём его вне UI-потока
+                if self.meeting_status:
+                    self.meeting_status.setText("Сохранение...")
+                # Ссылки на все идущие сохранения: новая запись может
+                # закончиться раньше, чем сохранится предыдущая
+                worker = MeetingSaveWorker(result["save"])
+                worker.finished.connect(self._on_meeting_saved)
+                self._save_workers = [w for w in self._save_workers if w.isRunning()]
+                self._save_workers.append(worker)
+                worker.start()
+            elif result and result.get("video"):
+                self._on_meeting_saved(result)
         except Exception as e:
             self._log(str(e))
     
+    def _on_meeting_saved(self, result):
+        if self.meeting_status and not self._meeting_recording:
+            self.meeting_status.setText("Готов")
+        if result and result.get("video"):
+            self._log("Видео сохранено")
+            # Небольшая задержка, чтобы файл точно появился на диске, затем обновить список
+            QTimer.singleShot(400, self._refresh_recordings)
+        elif result and result.get("error"):
+            self._log(f"Не удалось сохранить запись: {result['error']}")
+            # Временные файлы не удалены — подсказываем, где их искать
+            for key in ("tmp_video", "tmp_audio"):
+                if result.get(key):
+                    self._log(f"Временный файл: {result[key]}")
+    
     def _update_meeting_timer(self):
         if self._meeting_start_time and self.meeting_timer_label:
             elapsed = int(time.time() - self._meeting_start_time)
@@ -871,6 +911,9 @@ class MainWindow(QMainWindow):
                 self._stop_meeting_recording()
             except Exception:
                 pass
+        # Не выходим, пока фоновое сохранение записи не дописало файл
+        for worker in self._save_workers:
+            worker.wait()
         self.hotkey.stop()
         if hasattr(self, '_meeting_hotkey_listener') and self._meeting_hotkey_listener:
             try:
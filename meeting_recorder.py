@@ -2,10 +2,12 @@
 Запись экрана + микрофон (один поток).
 """
 import os
+import queue
+import struct
 import subprocess
 import threading
 import time
-import wave
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -16,11 +18,36 @@ except:
     pass
 
 import numpy as np
-import cv2
 import mss
 import sounddevice as sd
 
+try:
+    import dxcam
+    DXCAM_OK = True
+except Exception:
+    DXCAM_OK = False
+
 CREATE_NO_WINDOW = 0x08000000
+THREAD_PRIORITY_ABOVE_NORMAL = 1
+AUDIO_RING_SEC = 10  # запас кольца микрофона между сливами
+VIDEO_QUEUE_SEC = 1  # сколько секунд кадров может ждать энкодер
+DXCAM_FIRST_FRAME_SEC = 0.5  # ожидание первого кадра DXGI до перехода на mss
+ENCODER_PROBE_WAIT_SEC = 0.5  # сколько start() ждёт фоновую пробу энкодера
+ENCODER_FLUSH_SEC = 180  # сколько ждать, пока энкодер допишет файл после stop
+
+# Аппаратные H.264-энкодеры в порядке предпочтения; libx264 — запасной вариант
+HW_ENCODERS = [
+    # без -tune zerolatency: его понимает только libx264, nvenc отказывается стартовать
+    ('h264_nvenc', ['-preset', 'p4', '-tune', 'll', '-rc', 'vbr', '-cq', '23', '-b:v', '6M']),
+    ('h264_qsv', ['-preset', 'veryfast', '-global_quality', '23']),
+    ('h264_amf', ['-quality', 'speed', '-rc', 'cqp', '-qp_i', '23', '-qp_p', '23']),
+    ('h264_videotoolbox', ['-b:v', '6M']),
+]
+SW_ENCODER = ('libx264', ['-preset', 'ultrafast'])
+
+_encoder_lock = threading.Lock()
+_encoder_ready = threading.Event()
+_video_encoder = None
 
 
 def get_ffmpeg():
@@ -31,11 +58,222 @@ def get_ffmpeg():
         return "ffmpeg"
 
 
+def _probe_video_encoder():
+    ffmpeg = get_ffmpeg()
+    try:
+        listed = subprocess.run(
+            [ffmpeg, '-hide_banner', '-encoders'], capture_output=True,
+            creationflags=CREATE_NO_WINDOW, timeout=10
+        ).stdout
+    except Exception:
+        return SW_ENCODER
+    for name, args in HW_ENCODERS:
+        if name.encode() not in listed:
+            continue
+        # Кодек в сборке ещё не значит, что есть GPU — проверяем пробным кодированием
+        cmd = [
+            ffmpeg, '-hide_banner', '-f', 'lavfi', '-i', 'nullsrc=s=256x256:d=0.2',
+            '-c:v', name, *args, '-pix_fmt', 'yuv420p', '-f', 'null', '-'
+        ]
+        try:
+            proc = subprocess.run(cmd, capture_output=True, creationflags=CREATE_NO_WINDOW, timeout=15)
+            if proc.returncode == 0:
+                return name, args
+        except Exception:
+            pass
+    return SW_ENCODER
+
+
+def get_video_encoder():
+    # Проба ffmpeg выполняется один раз на процесс
+    global _video_encoder
+    with _encoder_lock:
+        if _video_encoder is None:
+            _video_encoder = _probe_video_encoder()
+            _encoder_ready.set()
+        return _video_encoder
+
+
+def ready_video_encoder(timeout):
+    # Для UI-потока: не ждём фоновую пробу дольше timeout — если она ещё
+    # идёт, эта сессия пишется через libx264
+    if _encoder_ready.wait(timeout):
+        return _video_encoder
+    return SW_ENCODER
+
+
+def wav_header(n_samples, rate, channels=1, bits=16):
+    block = channels * bits // 8
+    data_size = n_samples * block
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, channels, rate, rate * block, block, bits,
+        b'data', data_size
+    )
+
+
+def _create_dxcam():
+    if not DXCAM_OK:
+        return None
+    try:
+        return dxcam.create(output_color="BGRA")
+    except Exception:
+        return None
+
+
+@contextmanager
+def open_capture(region):
+    # Отдаёт функцию grab() -> BGRA-кадр (h, w, 4). На Windows — DXGI Desktop
+    # Duplication через dxcam (кадр приходит с GPU), иначе mss (GDI BitBlt)
+    w, h = region["width"], region["height"]
+    cam = _create_dxcam()
+    if cam is not None:
+        box = (region["left"], region["top"], region["left"] + w, region["top"] + h)
+        try:
+            # Первый настоящий кадр: dxcam держит одну камеру на выход, и в
+            # повторной сессии на статичном экране grab() отдаёт None — без
+            # этого запись начиналась бы с чёрного. Нет кадра — уходим на mss
+            last = None
+            deadline = time.monotonic() + DXCAM_FIRST_FRAME_SEC
+            while last is None and time.monotonic() < deadline:
+                try:
+                    last = cam.grab(region=box)
+                except Exception:
+                    break
+                if last is None:
+                    time.sleep(0.01)
+            if last is not None:
+                def grab():
+                    nonlocal last
+                    # None — экран не менялся с прошлого кадра, повторяем предыдущий
+                    frame = cam.grab(region=box)
+                    if frame is not None:
+                        last = frame
+                    return last
+                yield grab
+                return
+        finally:
+            try:
+                cam.release()
+            except Exception:
+                pass
+    
+    with mss.mss() as sct:
+        def grab():
+            img = sct.grab(region)
+            # Вид на буфер mss без копии (np.array копировал бы весь кадр)
+            return np.frombuffer(img.raw, dtype=np.uint8).reshape(h, w, 4)
+        yield grab
+
+
+def raise_thread_priority():
+    # Потоки захвата почти всё время в C (mss, PortAudio, запись в pipe) —
+    # повышенный приоритет спасает от пропусков, когда занят UI-поток
+    try:
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_ABOVE_NORMAL)
+    except Exception:
+        pass
+
+
+def enable_mmcss():
+    # Поток callback'а PortAudio — в класс MMCSS "Pro Audio": его не вытесняет
+    # фоновая работа (WASAPI в PortAudio делает это сам, MME/DirectSound — нет)
+    try:
+        task = ctypes.c_ulong(0)
+        ctypes.windll.avrt.AvSetMmThreadCharacteristicsW("Pro Audio", ctypes.byref(task))
+    except Exception:
+        pass
+
+
 def get_screen_size():
     user32 = ctypes.windll.user32
     return user32.GetSystemMetrics(0), user32.GetSystemMetrics(1)
 
 
+class AudioRing:
+    """Кольцо int16 без аллокаций: пишет callback PortAudio, читает поток записи."""
+    
+    def __init__(self, capacity):
+        self.buf = np.empty(capacity, dtype=np.int16)
+        self.written = 0
+        self.read = 0
+    
+    def write(self, samples):
+        size = len(self.buf)
+        n = len(samples)
+        i = self.written % size
+        k = min(n, size - i)
+        self.buf[i:i + k] = samples[:k]
+        self.buf[:n - k] = samples[k:]
+        # Счётчик публикуется после копирования — читатель не увидит недописанное
+        self.written += n
+    
+    def drain_into(self, pcm):
+        w = self.written
+        size = len(self.buf)
+        # Если читатель отстал больше чем на кольцо — старейшие сэмплы потеряны
+        r = max(self.read, w - size)
+        self.read = w
+        i, j = r % size, w % size
+        if w - r == 0:
+            return
+        if i < j:
+            pcm.append(self.buf[i:j])
+        else:
+            pcm.append(self.buf[i:])
+            pcm.append(self.buf[:j])
+
+
+class WavWriter:
+    """Потоковая запись mono int16 WAV: в RAM только текущий блок, размер — при закрытии."""
+    
+    def __init__(self, path, rate, gain=1):
+        self.path = path
+        self.rate = rate
+        self.gain = gain
+        self.samples = 0
+        self._f = open(path, 'wb')
+        self._f.write(wav_header(0, rate))
+    
+    def append(self, samples):
+        if self.gain != 1:
+            samples = np.clip(samples.astype(np.int32) * self.gain, -32768, 32767).astype(np.int16)
+        samples.tofile(self._f)
+        self.samples += len(samples)
+    
+    def close(self):
+        if self.samples:
+            self._f.seek(0)
+            self._f.write(wav_header(self.samples, self.rate))
+        self._f.close()
+        # Пустой файл не оставляем — сохранение поймёт, что звука нет
+        if not self.samples:
+            Path(self.path).unlink(missing_ok=True)
+
+
+class SaveJob:
+    """Фоновое сохранение одной сессии: свой поток и свой результат."""
+    
+    def __init__(self, target, args):
+        self.result = None
+        self._thread = threading.Thread(target=self._run, args=(target, args))
+        self._thread.start()
+    
+    def _run(self, target, args):
+        try:
+            self.result = target(*args)
+        except Exception as e:
+            self.result = {"video": None, "base_name": None, "error": str(e)}
+    
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            return None
+        return self.result
+
+
 class MeetingRecorder:
     def __init__(self, output_dir=None):
         # Папка records в корне проекта (создаётся автоматически)
@@ -44,12 +282,19 @@ class MeetingRecorder:
         
         self.fps = 15
         self.rate = 44100
+        self.capture_scale = 1.0  # <1 — уменьшать кадр перед кодированием
+        self.skip_static_frames = True  # не кодировать повторяющиеся кадры
         self.is_recording = False
-        self._stop_event = threading.Event()
+        self._stop_event = None
+        # Проба аппаратного энкодера в фоне, чтобы не тормозить запуск UI
+        threading.Thread(target=get_video_encoder, daemon=True).start()
         
-        self._frames = []
-        self._audio = []
+        self._counts = None
+        self._tmp_audio = None
         self._base_name = None
+        self._threads = []
+        self._encoder = None
+        self._tmp_video = None
     
     def get_microphones(self):
         mics = []
@@ -58,48 +303,189 @@ class MeetingRecorder:
                 mics.append({"id": i, "name": d['name'], "is_default": i == sd.default.device[0]})
         return mics
     
-    def _record_screen(self):
-        w, h = get_screen_size()
-        region = {"left": 0, "top": 0, "width": w, "height": h}
-        
-        with mss.mss() as sct:
-            while not self._stop_event.is_set():
-                t0 = time.time()
-                img = sct.grab(region)
-                frame = cv2.cvtColor(np.array(img), cv2.COLOR_BGRA2BGR)
-                self._frames.append(frame)
-                elapsed = time.time() - t0
-                time.sleep(max(0, 1.0/self.fps - elapsed))
-    
-    def _record_audio(self, device):
-        chunk = int(self.rate * 0.05)
+    def _record_screen(self, stop, counts, region, filled, free):
+        raise_thread_priority()
+        # Событие остановки, счётчики и регион — свои у каждой сессии:
+        # следующий start() не трогает потоки, ещё дописывающие прошлую
+        period_ns = 1_000_000_000 // self.fps
+        
+        # Производитель: захват + копия в буфер из пула. Если энкодер
+        # не успевает и свободных буферов нет — выбрасываем самый старый кадр
         try:
-            stream = sd.InputStream(
-                device=device, samplerate=self.rate, channels=1,
-                dtype='int16', blocksize=chunk
-            )
-            stream.start()
-            while not self._stop_event.is_set():
-                data, _ = stream.read(chunk)
-                self._audio.append(data.flatten().copy())
-            stream.stop()
-            stream.close()
+            with open_capture(region) as grab:
+                # Кадр n привязан к t0 + n*period по монотонным целочисленным
+                # часам: ни дрейфа от коррекции системного времени, ни накопления
+                # ошибки округления за часы записи
+                t0 = time.perf_counter_ns()
+                # Момент кадра 0 — по нему звук выравнивается при сведении:
+                # выбор бэкенда и ожидание первого кадра DXGI занимают время
+                counts["video_t0"] = t0
+                n = 0
+                while not stop.is_set():
+                    carry = 0
+                    try:
+                        buf = free.get_nowait()
+                    except queue.Empty:
+                        try:
+                            # Слоты выброшенного кадра переходят новому — длительность сохраняется
+                            buf, carry = filled.get_nowait()
+                            counts["dropped"] += 1
+                        except queue.Empty:
+                            buf = free.get()
+                    # BGRA как есть: перевод в YUV и масштаб делает ffmpeg
+                    np.copyto(buf, grab())
+                    n += 1
+                    sleep_ns = t0 + n * period_ns - time.perf_counter_ns()
+                    missed = 0
+                    if sleep_ns <= 0:
+                        # Не успели: пропускаем упущенные слоты, а не догоняем их пачкой
+                        missed = -sleep_ns // period_ns + 1
+                        counts["late"] += missed
+                        n += missed
+                    # Вход ffmpeg — постоянные 1/fps на кадр: кадр повторяется и за
+                    # упущенные слоты, иначе видео укорачивается и уходит от звука
+                    filled.put((buf, carry + 1 + missed))
+                    if sleep_ns > 0:
+                        time.sleep(sleep_ns / 1e9)
         except Exception:
             pass
+        finally:
+            filled.put(None)
     
-    def start(self, region=None, mic_device=None, record_system=False):
+    def _encode_frames(self, counts, pipe, filled, free):
+        # Потребитель: кадры уходят в stdin ffmpeg, который кодирует H.264
+        # параллельно захвату; медленный pipe не сбивает темп захвата
+        try:
+            while True:
+                item = filled.get()
+                if item is None:
+                    break
+                buf, repeat = item
+                try:
+                    for _ in range(repeat):
+                        pipe.write(buf)
+                    counts["frames"] += repeat
+                finally:
+                    free.put(buf)
+        except Exception:
+            pass
+        finally:
+            # EOF в stdin — ffmpeg дописывает файл и завершается
+            try:
+                pipe.close()
+            except Exception:
+                pass
+    
+    def _record_audio(self, stop, counts, device, tmp_audio):
+        raise_thread_priority()
+        # Родная частота устройства: иначе хост-API пересэмплирует каждый блок
+        # в реальном времени; AAC в итоговом файле принимает любую
+        try:
+            rate = int(sd.query_devices(device, 'input')['default_samplerate'])
+        except Exception:
+            rate = self.rate
+        chunk = int(rate * 0.05)
+        ring = AudioRing(rate * AUDIO_RING_SEC)
+        # Звук сразу уходит в WAV (с усилением x2) — к остановке он уже на диске
+        writer = WavWriter(tmp_audio, rate, gain=2)
+        
+        mmcss = False
+        
+        def callback(indata, frames, time_info, status):
+            nonlocal mmcss
+            if not mmcss:
+                mmcss = True
+                enable_mmcss()
+                # Момент первого сэмпла: блок уже записан к вызову callback'а
+                counts["audio_t0"] = time.perf_counter_ns() - frames * 1_000_000_000 // rate
+            ring.write(np.frombuffer(indata, dtype=np.int16))
+        
+        try:
+            # Callback-поток PortAudio кладёт блоки в кольцо; здесь только
+            # периодический слив крупными кусками вместо read()+copy() на каждый блок
+            with sd.RawInputStream(
+                device=device, samplerate=rate, channels=1,
+                dtype='int16', blocksize=chunk, latency='low', callback=callback
+            ):
+                while not stop.wait(0.5):
+                    ring.drain_into(writer)
+            ring.drain_into(writer)
+        except Exception:
+            pass
+        finally:
+            writer.close()
+    
+    def start(self, region=None, mic_device=None, record_system=False, scale=None):
         if self.is_recording:
             return False
         
-        self._frames = []
-        self._audio = []
-        self._stop_event.clear()
+        self._stop_event = threading.Event()
+        self._counts = {"frames": 0, "dropped": 0, "late": 0, "video_t0": None, "audio_t0": None}
         
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         self._base_name = f"Meeting_{ts}"
+        self._tmp_audio = self.output_dir / f"{self._base_name}_tmp.wav"
+        
+        if region is None:
+            w, h = get_screen_size()
+            region = {"left": 0, "top": 0, "width": w, "height": h}
+        # yuv420p требует чётных размеров
+        region = dict(region, width=region["width"] & ~1, height=region["height"] & ~1)
+        
+        # Уменьшение кадра перед кодированием: вдвое по сторонам — вчетверо меньше пикселей
+        scale = self.capture_scale if scale is None else scale
+        out_w = int(region["width"] * scale) & ~1
+        out_h = int(region["height"] * scale) & ~1
+        
+        # Пул кадров между захватом и энкодером ограничивает RAM: не больше
+        # VIDEO_QUEUE_SEC секунд несжатого видео в очереди. Слоты — срезы
+        # одного непрерывного массива: одна аллокация на сессию, без фрагментации.
+        # Свободные слоты — стек (LIFO): пока энкодер успевает, по кругу ходят
+        # 2–3 «горячих» слота, а страницы остальных ОС так и не выделяет
+        filled, free = queue.Queue(), queue.LifoQueue()
+        pool = np.empty((max(3, self.fps * VIDEO_QUEUE_SEC), region["height"], region["width"], 4), dtype=np.uint8)
+        for slot in pool:
+            free.put(slot)
+        
+        # Энкодер живёт всю сессию: сырые BGRA-кадры в stdin (альфа — заполнитель), H.264 на выходе
+        # (NVENC/QSV/AMF, если доступны — CPU остаётся захвату);
+        # -pix_fmt yuv420p — совместимость с плеерами Windows
+        self._tmp_video = self.output_dir / f"{self._base_name}_tmp.mp4"
+        vcodec, vargs = ready_video_encoder(ENCODER_PROBE_WAIT_SEC)
+        # Статичный экран (слайд, документ) — mpdecimate выкидывает повторы до
+        # кодирования, остальные кадры сохраняют свои метки времени (VFR);
+        # max — хотя бы один кадр в секунду, чтобы длина видео не «съезжала»
+        filters, vfr = [], []
+        if self.skip_static_frames:
+            filters.append(f'mpdecimate=max={self.fps}')
+            vfr = ['-fps_mode', 'vfr']
+        # Масштаб — тоже в ffmpeg (SIMD, в процессе энкодера), а не cv2.resize
+        # в потоке захвата; после mpdecimate, чтобы не масштабировать повторы
+        if (out_w, out_h) != (region["width"], region["height"]):
+            filters.append(f'scale={out_w}:{out_h}:flags=lanczos')
+        vf = ['-vf', ','.join(filters)] if filters else []
+        cmd = [
+            get_ffmpeg(), '-y', '-f', 'rawvideo', '-pix_fmt', 'bgr0',
+            '-s', f'{region["width"]}x{region["height"]}', '-r', str(self.fps), '-i', '-',
+            *vf, *vfr, '-c:v', vcodec, *vargs, '-pix_fmt', 'yuv420p',
+            str(self._tmp_video)
+        ]
+        try:
+            self._encoder = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL, creationflags=CREATE_NO_WINDOW
+            )
+        except Exception:
+            return False
         
-        threading.Thread(target=self._record_screen, daemon=True).start()
-        threading.Thread(target=self._record_audio, args=(mic_device,), daemon=True).start()
+        stop, counts = self._stop_event, self._counts
+        self._threads = [
+            threading.Thread(target=self._record_screen, args=(stop, counts, region, filled, free), daemon=True),
+            threading.Thread(target=self._encode_frames, args=(counts, self._encoder.stdin, filled, free), daemon=True),
+            threading.Thread(target=self._record_audio, args=(stop, counts, mic_device, self._tmp_audio), daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
         
         self.is_recording = True
         return True
@@ -110,62 +496,95 @@ class MeetingRecorder:
         
         self._stop_event.set()
         self.is_recording = False
-        time.sleep(0.3)
-        return self._save()
+        # stdin энкодера закрывается после слива очереди кадров, WAV закрывается
+        # в finally потока звука — join и есть сигнал готовности. Здесь общий
+        # срок 3 с, чтобы счётчики пропусков были почти итоговыми; дожидается
+        # потоков до конца уже сохранение, вне UI-потока
+        threads = self._threads
+        deadline = time.monotonic() + 3
+        for t in threads:
+            t.join(timeout=max(0, deadline - time.monotonic()))
+        self._threads = []
+        
+        # Сохранение идёт в фоне над снимком сессии: UI не ждёт ffmpeg,
+        # а новую запись можно начать сразу. Результат ждут через "save" —
+        # у каждой сессии свой, следующая запись его не перезапишет
+        base_name = self._base_name
+        counts = self._counts
+        job = SaveJob(self._save, (base_name, threads, self._encoder, self._tmp_video,
+                                   self._tmp_audio, counts))
+        self._encoder = None
+        return {"video": None, "base_name": base_name, "pending": True, "save": job,
+                "dropped_frames": counts["dropped"], "late_frames": counts["late"]}
     
-    def _save(self):
-        if not self._frames:
+    def _save(self, base_name, threads, encoder, tmp_video, tmp_audio, counts):
+        # Пока потоки сессии не вышли, число кадров не итоговое, а у WAV
+        # может быть ещё нулевой заголовок. Захват и звук выходят сами по stop;
+        # поток энкодера может висеть в pipe.write, если ffmpeg перестал читать
+        screen, encode, audio = threads
+        screen.join()
+        audio.join()
+        deadline = time.monotonic() + ENCODER_FLUSH_SEC
+        encode.join(timeout=max(0, deadline - time.monotonic()))
+        hung = encode.is_alive()
+        if not hung:
+            try:
+                encoder.wait(timeout=max(0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                hung = True
+        if hung:
+            # Энкодер завис: moov не дописан, временный MP4 битый. kill рвёт
+            # pipe и отпускает pipe.write. Сохранённым не считаем, временные
+            # файлы оставляем для восстановления
+            encoder.kill()
+            encoder.wait()
+            encode.join()
+            return {"video": None, "base_name": base_name,
+                    "error": "Энкодер не завершился вовремя",
+                    "tmp_video": str(tmp_video),
+                    "tmp_audio": str(tmp_audio) if tmp_audio.exists() else None}
+        frame_count = counts["frames"]
+        
+        if not frame_count or not tmp_video.exists():
+            # Пустая сессия: не оставляем _tmp.mp4 в списке записей
+            tmp_video.unlink(missing_ok=True)
+            tmp_audio.unlink(missing_ok=True)
             return {"video": None, "base_name": None}
         
-        tmp_video = self.output_dir / f"{self._base_name}_tmp.avi"
-        tmp_audio = self.output_dir / f"{self._base_name}_tmp.wav"
-        final_video = self.output_dir / f"{self._base_name}.mp4"
+        final_video = self.output_dir / f"{base_name}.mp4"
         
-        h, w = self._frames[0].shape[:2]
-        out = cv2.VideoWriter(str(tmp_video), cv2.VideoWriter_fourcc(*'XVID'), self.fps, (w, h))
-        try:
-            for f in self._frames:
-                out.write(f)
-        finally:
-            out.release()
-            del out
-        
-        if self._audio:
-            arr = np.concatenate(self._audio)
-            arr = np.clip(arr.astype(np.int32) * 2, -32768, 32767).astype(np.int16)
-            with wave.open(str(tmp_audio), 'wb') as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)
-                wf.setframerate(self.rate)
-                wf.writeframes(arr.tobytes())
-        
-        ffmpeg = get_ffmpeg()
-        # -pix_fmt yuv420p — совместимость с плеерами Windows; -movflags +faststart, -flush_packets 1
+        # Видео уже в H.264 — только копируем поток и добавляем звук. moov в
+        # начало файла (faststart) переносится один раз, здесь: энкодер пишет
+        # временный файл без него, иначе переписывал бы его целиком при stop
         if tmp_audio.exists():
-            cmd = [
-                ffmpeg, '-y', '-i', str(tmp_video), '-i', str(tmp_audio),
+            # Оба файла начинаются с 0, а реально звук пошёл раньше или позже
+            # кадра 0: сдвигаем звук (-itsoffset) или срезаем его начало (-ss)
+            offset = 0.0
+            if counts["video_t0"] is not None and counts["audio_t0"] is not None:
+                offset = (counts["audio_t0"] - counts["video_t0"]) / 1e9
+            align = ['-itsoffset', f'{offset:.3f}'] if offset > 0 else ['-ss', f'{-offset:.3f}']
+            streams = [
+                '-i', str(tmp_video), *align, '-i', str(tmp_audio),
                 '-filter_complex', '[1:a]volume=2[a]', '-map', '0:v', '-map', '[a]',
-                '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
-                '-c:a', 'aac', '-b:a', '192k',
-                '-movflags', '+faststart', '-flush_packets', '1',
-                '-shortest', str(final_video)
+                '-c:v', 'copy', '-c:a', 'aac', '-b:a', '192k',
             ]
         else:
-            cmd = [
-                ffmpeg, '-y', '-i', str(tmp_video),
-                '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p',
-                '-movflags', '+faststart', '-flush_packets', '1',
-                str(final_video)
-            ]
-        
+            streams = ['-i', str(tmp_video), '-c', 'copy']
+        cmd = [
+            get_ffmpeg(), '-y', *streams,
+            '-movflags', '+faststart', '-flush_packets', '1',
+            str(final_video)
+        ]
         try:
             proc = subprocess.run(cmd, capture_output=True, creationflags=CREATE_NO_WINDOW, timeout=180)
-            if proc.returncode != 0:
-                proc = None
+            ok = proc.returncode == 0
         except Exception:
-            proc = None
+            ok = False
+        if not ok:
+            # Недописанный итоговый файл не выдаём за запись — остаётся временный
+            final_video.unlink(missing_ok=True)
         
-        # Освобождение памяти: удаляем временные файлы и очищаем буферы
+        # Удаляем временные файлы
         if final_video.exists():
             try:
                 tmp_video.unlink(missing_ok=True)
@@ -173,10 +592,6 @@ class MeetingRecorder:
             except Exception:
                 pass
         
-        # Полная очистка буферов после сохранения
-        self._frames.clear()
-        self._audio.clear()
-        
         if final_video.exists():
-            return {"video": str(final_video), "base_name": self._base_name}
-        return {"video": str(tmp_video), "base_name": self._base_name}
+            return {"video": str(final_video), "base_name": base_name}
+        return {"video": str(tmp_video), "base_name": base_name}